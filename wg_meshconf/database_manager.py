@@ -4,7 +4,7 @@
 Name: Database Manager
 Creator: K4YT3X
 Date Created: July 19, 2020
-Last Modified: June 16, 2021
+Last Modified: October 19, 2026
 """
 
 import copy
@@ -15,6 +15,7 @@ import sys
 from rich.console import Console
 from rich.table import Table
 
+from .watcher import create_watcher
 from .wireguard import WireGuard
 
 INTERFACE_ATTRIBUTES = [
@@ -62,6 +63,15 @@ PEER_OPTIONAL_ATTRIBUTES_LOCAL = [
     "PersistentKeepalive",
 ]
 
+# attributes of a peer which are rendered into other peers' configuration files
+REMOTE_RENDERED_ATTRIBUTES = [
+    "PrivateKey",
+    "Endpoint",
+    "ListenPort",
+    "Address",
+    "AllowedIPs",
+] + PEER_OPTIONAL_ATTRIBUTES_REMOTE
+
 ALL_ATTRIBUTES = INTERFACE_ATTRIBUTES + PEER_ATTRIBUTES_REMOTE + PEER_ATTRIBUTES_LOCAL
 
 KEY_TYPE = {
@@ -89,6 +99,7 @@ class DatabaseManager:
         self.database_path = database_path
         self.database_template = {"peers": {}}
         self.wireguard = WireGuard()
+        self.pubkey_cache = {}
 
     def init(self):
         """initialize an empty database file"""
@@ -317,17 +328,85 @@ class DatabaseManager:
         # print the constructed table in console
         Console().print(table)
 
-    def genconfig(self, Name: str, output: pathlib.Path):
-        database = self.read_database()
+    def pubkey(self, PrivateKey: str) -> str:
+        """derive a public key, caching the result
 
-        # check if peer ID is specified
-        if Name is not None:
-            peers = [Name]
-        else:
-            peers = [p for p in database["peers"]]
+        Args:
+            PrivateKey (str): WireGuard private key encoded in base64 format
+
+        Returns:
+            str: corresponding public key encoded in base64 format
+        """
+        if PrivateKey not in self.pubkey_cache:
+            self.pubkey_cache[PrivateKey] = self.wireguard.pubkey(PrivateKey)
+        return self.pubkey_cache[PrivateKey]
 
-        # check if output directory is valid
-        # create output directory if it does not exist
+    def renderconfig(self, Name: str, database: dict) -> str:
+        """render the configuration file of a peer
+
+        Args:
+            Name (str): name of the peer
+            database (dict): content of database
+
+        Returns:
+            str: content of the peer's configuration file
+        """
+        local_peer = database["peers"][Name]
+
+        config = []
+        config.append("[Interface]\n")
+        config.append("# Name: {}\n".format(Name))
+        config.append("Address = {}\n".format(", ".join(local_peer["Address"])))
+        config.append("PrivateKey = {}\n".format(local_peer["PrivateKey"]))
+
+        for key in INTERFACE_OPTIONAL_ATTRIBUTES:
+            if local_peer.get(key) is not None:
+                config.append("{} = {}\n".format(key, local_peer[key]))
+
+        # generate [Peer] sections for all other peers
+        for p in [i for i in database["peers"] if i != Name]:
+            remote_peer = database["peers"][p]
+
+            config.append("\n[Peer]\n")
+            config.append("# Name: {}\n".format(p))
+            config.append(
+                "PublicKey = {}\n".format(self.pubkey(remote_peer["PrivateKey"]))
+            )
+
+            if remote_peer.get("Endpoint") is not None:
+                config.append(
+                    "Endpoint = {}:{}\n".format(
+                        remote_peer["Endpoint"],
+                        remote_peer["ListenPort"],
+                    )
+                )
+
+            if remote_peer.get("Address") is not None:
+                if remote_peer.get("AllowedIPs") is not None:
+                    allowed_ips = ", ".join(
+                        remote_peer["Address"] + remote_peer["AllowedIPs"]
+                    )
+                else:
+                    allowed_ips = ", ".join(remote_peer["Address"])
+                config.append("AllowedIPs = {}\n".format(allowed_ips))
+
+            for key in PEER_OPTIONAL_ATTRIBUTES_REMOTE:
+                if remote_peer.get(key) is not None:
+                    config.append("{} = {}\n".format(key, remote_peer[key]))
+
+            for key in PEER_OPTIONAL_ATTRIBUTES_LOCAL:
+                if local_peer.get(key) is not None:
+                    config.append("{} = {}\n".format(key, local_peer[key]))
+
+        return "".join(config)
+
+    def prepare_output(self, output: pathlib.Path):
+        """check if output directory is valid
+        create output directory if it does not exist
+
+        Args:
+            output (pathlib.Path): configuration file output directory
+        """
         if output.exists() and not output.is_dir():
             print(
                 "Error: output path already exists and is not a directory",
@@ -338,53 +417,165 @@ class DatabaseManager:
             print(f"Creating output directory: {output}", file=sys.stderr)
             output.mkdir(exist_ok=True)
 
+    def genconfig(self, Name: str, output: pathlib.Path):
+        database = self.read_database()
+
+        # check if peer ID is specified
+        if Name is not None:
+            peers = [Name]
+        else:
+            peers = [p for p in database["peers"]]
+
+        self.prepare_output(output)
+
         # for every peer in the database
         for peer in peers:
-            local_peer = database["peers"][peer]
-
             with (output / f"{peer}.conf").open("w") as config:
-                config.write("[Interface]\n")
-                config.write("# Name: {}\n".format(peer))
-                config.write("Address = {}\n".format(", ".join(local_peer["Address"])))
-                config.write("PrivateKey = {}\n".format(local_peer["PrivateKey"]))
-
-                for key in INTERFACE_OPTIONAL_ATTRIBUTES:
-                    if local_peer.get(key) is not None:
-                        config.write("{} = {}\n".format(key, local_peer[key]))
-
-                # generate [Peer] sections for all other peers
-                for p in [i for i in database["peers"] if i != peer]:
-                    remote_peer = database["peers"][p]
-
-                    config.write("\n[Peer]\n")
-                    config.write("# Name: {}\n".format(p))
-                    config.write(
-                        "PublicKey = {}\n".format(
-                            self.wireguard.pubkey(remote_peer["PrivateKey"])
-                        )
-                    )
+                config.write(self.renderconfig(peer, database))
+
+    def changedpeers(self, old: dict, new: dict) -> set:
+        """find peers whose configuration may differ between two databases
+
+        Args:
+            old (dict): previous content of database
+            new (dict): current content of database
 
-                    if remote_peer.get("Endpoint") is not None:
-                        config.write(
-                            "Endpoint = {}:{}\n".format(
-                                remote_peer["Endpoint"],
-                                remote_peer["ListenPort"],
-                            )
+        Returns:
+            set: names of peers in the new database to be re-rendered
+        """
+        # adding, removing or reordering peers changes the
+        #   [Peer] sections of every configuration file
+        if list(old["peers"]) != list(new["peers"]):
+            return set(new["peers"])
+
+        changed = set()
+        for peer in new["peers"]:
+            old_peer = old["peers"][peer]
+            new_peer = new["peers"][peer]
+
+            if old_peer == new_peer:
+                continue
+            changed.add(peer)
+
+            # attributes rendered into other peers' configuration files
+            if any(
+                old_peer.get(key) != new_peer.get(key)
+                for key in REMOTE_RENDERED_ATTRIBUTES
+            ):
+                return set(new["peers"])
+
+        return changed
+
+    def watchconfig(
+        self,
+        Name: str,
+        output: pathlib.Path,
+        interval: float = 1.0,
+        debounce: float = 0.5,
+    ):
+        """regenerate configuration files whenever the database changes
+
+        Args:
+            Name (str): name of the peer to generate configuration for, all if None
+            output (pathlib.Path): configuration file output directory
+            interval (float): polling interval if inotify is unavailable
+            debounce (float): seconds without changes to wait before regenerating
+        """
+        self.prepare_output(output)
+
+        database = copy.deepcopy(self.database_template)
+        rendered = {}
+        watcher = create_watcher(self.database_path, interval)
+        print(
+            f"Watching {self.database_path} for changes ({watcher.method})",
+            file=sys.stderr,
+        )
+
+        try:
+            while True:
+                if not self.database_path.is_file():
+                    print(
+                        f"Database file {self.database_path} not found", file=sys.stderr
+                    )
+                else:
+                    # the previous database is kept on errors so the next
+                    #   cycle re-renders everything this one did not finish
+                    try:
+                        new_database = self.read_database()
+                        self.regenerate(Name, output, database, new_database, rendered)
+                    except (
+                        csv.Error,
+                        KeyError,
+                        OSError,
+                        TypeError,
+                        ValueError,
+                    ) as error:
+                        print(
+                            "Error regenerating configuration: {}: {}".format(
+                                type(error).__name__, error
+                            ),
+                            file=sys.stderr,
                         )
+                    else:
+                        database = new_database
+
+                # wait for a change, then wait until edits settle down
+                watcher.wait()
+                while watcher.wait(debounce):
+                    pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
+
+    def regenerate(
+        self,
+        Name: str,
+        output: pathlib.Path,
+        old: dict,
+        new: dict,
+        rendered: dict,
+    ):
+        """re-render and write configuration files of changed peers
 
-                    if remote_peer.get("Address") is not None:
-                        if remote_peer.get("AllowedIPs") is not None:
-                            allowed_ips = ", ".join(
-                                remote_peer["Address"] + remote_peer["AllowedIPs"]
-                            )
-                        else:
-                            allowed_ips = ", ".join(remote_peer["Address"])
-                        config.write("AllowedIPs = {}\n".format(allowed_ips))
-
-                    for key in PEER_OPTIONAL_ATTRIBUTES_REMOTE:
-                        if remote_peer.get(key) is not None:
-                            config.write("{} = {}\n".format(key, remote_peer[key]))
-
-                    for key in PEER_OPTIONAL_ATTRIBUTES_LOCAL:
-                        if local_peer.get(key) is not None:
-                            config.write("{} = {}\n".format(key, local_peer[key]))
+        Args:
+            Name (str): name of the peer to generate configuration for, all if None
+            output (pathlib.Path): configuration file output directory
+            old (dict): previous content of database
+            new (dict): current content of database
+            rendered (dict): configuration of each peer written to the output
+                directory, updated in place as files are written or removed
+        """
+        peers = self.changedpeers(old, new)
+        if Name is not None:
+            peers &= {Name}
+            if Name not in new["peers"]:
+                print(f"Peer with name {Name} does not exist", file=sys.stderr)
+
+        # render every changed peer before touching any file so that an
+        #   invalid database does not leave the output half regenerated
+        configs = {}
+        for peer in sorted(peers):
+            config = self.renderconfig(peer, new)
+            if rendered.get(peer) != config:
+                configs[peer] = config
+
+        # remove configuration files of deleted peers
+        for peer in old["peers"]:
+            if peer not in new["peers"] and (Name is None or peer == Name):
+                if (output / f"{peer}.conf").exists():
+                    (output / f"{peer}.conf").unlink()
+                    print(f"Removed configuration of peer {peer}", file=sys.stderr)
+                rendered.pop(peer, None)
+
+        for peer, config in configs.items():
+            with (output / f"{peer}.conf").open("w") as config_file:
+                config_file.write(config)
+            rendered[peer] = config
+            print(f"Regenerated configuration of peer {peer}", file=sys.stderr)
+
+        # forget public keys of private keys no longer in use
+        private_keys = {p.get("PrivateKey") for p in new["peers"].values()}
+        self.pubkey_cache = {
+            k: v for k, v in self.pubkey_cache.items() if k in private_keys
+        }
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Deploy Manager
+Creator: K4YT3X
+Date Created: October 19, 2026
+Last Modified: October 19, 2026
+
+The DeployManager class pushes configuration files rendered by
+    genconfig to their nodes concurrently through a pluggable transport.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import pathlib
+import shlex
+import signal
+import sys
+import time
+
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+# name of the file in the output directory which records the hash
+#   of the content last deployed to each peer's target
+DEPLOY_STATE_FILE = ".deploy_state.json"
+
+
+class Transport:
+    """base class of all deployment transports
+
+    subclasses implement target and push
+    """
+
+    def target(self, name: str, peer: dict) -> str:
+        """describe where a peer's configuration will be deployed to
+
+        Args:
+            name (str): name of the peer
+            peer (dict): peer's entry in the database
+
+        Returns:
+            str: human-readable destination, also used in the deploy state
+        """
+        raise NotImplementedError
+
+    async def push(self, name: str, peer: dict, content: bytes):
+        """deploy a peer's configuration
+
+        Args:
+            name (str): name of the peer
+            peer (dict): peer's entry in the database
+            content (bytes): content of the configuration file
+
+        Raises:
+            Exception: if the configuration could not be deployed
+        """
+        raise NotImplementedError
+
+
+class DirectoryTransport(Transport):
+    """copy configuration files into a local directory
+
+    the destination can either be a directory, in which case the files
+        are saved as <destination>/<name>.conf, or a path template
+        containing {name}, e.g. /srv/nodes/{name}/wg0.conf
+    """
+
+    def __init__(self, destination: str):
+        validate_template(destination, "destination", name="")
+        self.destination = destination
+
+    def target(self, name: str, peer: dict) -> str:
+        if "{name}" in self.destination:
+            return self.destination.format(name=name)
+        return str(pathlib.Path(self.destination) / f"{name}.conf")
+
+    async def push(self, name: str, peer: dict, content: bytes):
+        path = pathlib.Path(self.target(name, peer))
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._write, path, content
+        )
+
+    @staticmethod
+    def _write(path: pathlib.Path, content: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write into a temporary file first so the destination
+        #   never contains a partially written configuration
+        temporary = path.with_name(f".{path.name}.tmp")
+        temporary.write_bytes(content)
+        os.replace(temporary, path)
+
+
+class CommandTransport(Transport):
+    """pipe configuration files into a shell command
+
+    the command is formatted with shell-quoted {name} and {endpoint}
+        ({endpoint} falls back to the peer's name if it has no endpoint)
+        and receives the configuration on its standard input
+    """
+
+    def __init__(self, command: str):
+        validate_template(command, "command", name="", endpoint="")
+        self.command = command
+
+    def target(self, name: str, peer: dict) -> str:
+        return self.command.format(
+            name=shlex.quote(name),
+            endpoint=shlex.quote(peer.get("Endpoint") or name),
+        )
+
+    async def push(self, name: str, peer: dict, content: bytes):
+        process = await asyncio.create_subprocess_shell(
+            self.target(name, peer),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+
+        try:
+            _, stderr = await process.communicate(content)
+        except asyncio.CancelledError:
+            # do not leave the command running if the deployment times out
+            # the whole process group is killed since the shell's
+            #   children would otherwise keep the pipes open
+            if process.returncode is None:
+                if hasattr(os, "killpg"):
+                    os.killpg(process.pid, signal.SIGKILL)
+                else:
+                    process.kill()
+                await process.wait()
+            raise
+
+        if process.returncode != 0:
+            raise RuntimeError(
+                "command exited with code {}: {}".format(
+                    process.returncode, stderr.decode(errors="replace").strip()
+                )
+            )
+
+
+def validate_template(template: str, description: str, **placeholders):
+    """check that a template can be formatted with the given placeholders
+
+    Args:
+        template (str): template to check
+        description (str): what the template is, used in the error message
+        **placeholders: placeholders supported by the template
+
+    Raises:
+        ValueError: if the template cannot be formatted
+    """
+    try:
+        template.format(**placeholders)
+    except (IndexError, KeyError, ValueError) as error:
+        raise ValueError(
+            "invalid {} template {!r}: supported placeholders are {}, "
+            "literal braces must be doubled as {{{{ and }}}} ({}: {})".format(
+                description,
+                template,
+                ", ".join("{" + p + "}" for p in placeholders),
+                type(error).__name__,
+                error,
+            )
+        )
+
+
+TRANSPORTS = {
+    "directory": DirectoryTransport,
+    "ssh": CommandTransport,
+}
+
+
+class DeployManager:
+    def __init__(
+        self,
+        transport: Transport,
+        jobs: int = 16,
+        retries: int = 3,
+        backoff: float = 1.0,
+        timeout: float = 30.0,
+        force: bool = False,
+    ):
+        self.transport = transport
+        self.jobs = jobs
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.force = force
+
+    def deploy(self, Name: str, database: dict, source: pathlib.Path) -> bool:
+        """deploy configuration files generated by genconfig
+
+        Args:
+            Name (str): name of the peer to deploy, all peers if None
+            database (dict): content of database
+            source (pathlib.Path): directory containing the configuration files
+
+        Returns:
+            bool: True if all deployments succeeded
+        """
+        if not source.is_dir():
+            print(f"Error: directory {source} does not exist", file=sys.stderr)
+            return False
+
+        # only peers in the database are deployed since genconfig
+        #   does not remove configuration files of deleted peers
+        if Name is not None:
+            if Name not in database["peers"]:
+                print(f"Peer with name {Name} does not exist", file=sys.stderr)
+                return False
+            peers = [Name]
+        else:
+            peers = sorted(database["peers"])
+            for orphan in sorted(
+                p.stem for p in source.glob("*.conf") if p.stem not in database["peers"]
+            ):
+                print(
+                    f"Warning: skipping {orphan}.conf, peer is not in the database",
+                    file=sys.stderr,
+                )
+
+        state_path = source / DEPLOY_STATE_FILE
+        state = self._read_state(state_path)
+
+        results = asyncio.run(self._deploy_all(peers, database, source, state))
+
+        # remember what has been deployed successfully so
+        #   unchanged configurations can be skipped next time
+        for result in results:
+            if result["status"] == "deployed":
+                targets = state.setdefault(result["name"], {})
+                targets[result["target"]] = result["hash"]
+        self._write_state(state_path, state)
+
+        self._print_results(results)
+        return all(r["status"] != "failed" for r in results)
+
+    async def _deploy_all(
+        self, peers: list, database: dict, source: pathlib.Path, state: dict
+    ) -> list:
+        semaphore = asyncio.Semaphore(self.jobs)
+        return await asyncio.gather(
+            *[
+                self._deploy_one(
+                    semaphore,
+                    peer,
+                    database["peers"][peer],
+                    source / f"{peer}.conf",
+                    state,
+                )
+                for peer in peers
+            ]
+        )
+
+    async def _deploy_one(
+        self,
+        semaphore: asyncio.Semaphore,
+        name: str,
+        peer: dict,
+        path: pathlib.Path,
+        state: dict,
+    ) -> dict:
+        result = {
+            "name": name,
+            "target": None,
+            "hash": None,
+            "status": "failed",
+            "attempts": 0,
+            "elapsed": 0.0,
+            "error": None,
+        }
+
+        try:
+            result["target"] = self.transport.target(name, peer)
+            content = path.read_bytes()
+        except Exception as error:
+            result["error"] = str(error)
+            return result
+        result["hash"] = hashlib.sha256(content).hexdigest()
+
+        if (
+            not self.force
+            and state.get(name, {}).get(result["target"]) == result["hash"]
+        ):
+            result["status"] = "skipped"
+            return result
+
+        start = None
+        for attempt in range(1, self.retries + 2):
+            # the semaphore is only held during an attempt so that
+            #   backing off does not take up a slot of other peers
+            async with semaphore:
+                if start is None:
+                    start = time.monotonic()
+                result["attempts"] = attempt
+                try:
+                    await asyncio.wait_for(
+                        self.transport.push(name, peer, content), self.timeout
+                    )
+                    result["status"] = "deployed"
+                    result["error"] = None
+                except asyncio.TimeoutError:
+                    result["error"] = f"timed out after {self.timeout}s"
+                except Exception as error:
+                    result["error"] = str(error)
+
+            if result["status"] == "deployed":
+                break
+
+            # back off exponentially before retrying
+            if attempt <= self.retries:
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+        result["elapsed"] = time.monotonic() - start
+
+        return result
+
+    @staticmethod
+    def _read_state(state_path: pathlib.Path) -> dict:
+        if not state_path.is_file():
+            return {}
+
+        # a damaged state file only means everything gets deployed again
+        try:
+            with state_path.open(mode="r", encoding="utf-8") as state_file:
+                state = json.load(state_file)
+        except (OSError, ValueError) as error:
+            print(f"Warning: ignoring {state_path}: {error}", file=sys.stderr)
+            return {}
+
+        if not isinstance(state, dict) or not all(
+            isinstance(targets, dict) for targets in state.values()
+        ):
+            print(f"Warning: ignoring malformed {state_path}", file=sys.stderr)
+            return {}
+
+        return state
+
+    @staticmethod
+    def _write_state(state_path: pathlib.Path, state: dict):
+        # write into a temporary file first so an interrupted
+        #   write does not discard the previous state
+        temporary = state_path.with_name(f"{state_path.name}.tmp")
+        try:
+            with temporary.open(mode="w", encoding="utf-8") as state_file:
+                json.dump(state, state_file, indent=2, sort_keys=True)
+            os.replace(temporary, state_path)
+        except OSError as error:
+            print(f"Warning: cannot save {state_path}: {error}", file=sys.stderr)
+            if temporary.is_file():
+                temporary.unlink()
+
+    @staticmethod
+    def _print_results(results: list):
+        table = Table(show_lines=True)
+        table.add_column("Name", style="cyan")
+        table.add_column("Target")
+        table.add_column("Status")
+        table.add_column("Attempts", style="yellow")
+        table.add_column("Time")
+        table.add_column("Error", style="red")
+
+        for result in results:
+            table.add_row(
+                escape(result["name"]),
+                escape(result["target"] or ""),
+                {
+                    "deployed": "[green]deployed[/green]",
+                    "skipped": "[dim]skipped[/dim]",
+                    "failed": "[red]failed[/red]",
+                }[result["status"]],
+                str(result["attempts"]),
+                "{:.2f}s".format(result["elapsed"]),
+                escape(result["error"] or ""),
+            )
+
+        Console().print(table)
+        print(
+            "{} deployed, {} skipped, {} failed".format(
+                *[
+                    sum(r["status"] == s for r in results)
+                    for s in ["deployed", "skipped", "failed"]
+                ]
+            )
+        )
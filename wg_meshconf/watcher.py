@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name: Database File Watcher
+Creator: K4YT3X
+Date Created: October 19, 2026
+Last Modified: October 19, 2026
+
+The watcher classes block until the database file changes, using
+    inotify where it is available and mtime polling elsewhere.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import pathlib
+import select
+import struct
+import time
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """watch a file with Linux's inotify
+
+    the parent directory is watched instead of the file itself since
+        editors often save files by replacing them; symbolic links are
+        resolved first, so edits to the link's target are detected but
+        pointing the link somewhere else is not
+    """
+
+    method = "inotify"
+
+    def __init__(self, path: pathlib.Path):
+        path = path.resolve()
+        self.name = os.fsencode(path.name)
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        watch = libc.inotify_add_watch(
+            self.fd,
+            os.fsencode(path.parent),
+            IN_MODIFY
+            | IN_CLOSE_WRITE
+            | IN_MOVED_FROM
+            | IN_MOVED_TO
+            | IN_CREATE
+            | IN_DELETE,
+        )
+        if watch < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def wait(self, timeout: float = None) -> bool:
+        """wait for the file to change
+
+        Args:
+            timeout (float): seconds to wait, forever if None
+
+        Returns:
+            bool: True if the file changed before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+
+            readable, _, _ = select.select([self.fd], [], [], remaining)
+            if not readable:
+                return False
+
+            # events of other files in the same directory are ignored
+            if self.name in self._read_names():
+                return True
+
+    def _read_names(self) -> list:
+        try:
+            buffer = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+
+        names = []
+        offset = 0
+        while offset < len(buffer):
+            _, _, _, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT.size
+            names.append(buffer[offset : offset + length].rstrip(b"\0"))
+            offset += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """watch a file by polling its modification time and size"""
+
+    method = "polling"
+
+    def __init__(self, path: pathlib.Path, interval: float = 1.0):
+        self.path = path
+        self.interval = interval
+        self.status = self._stat()
+
+    def _stat(self) -> tuple:
+        try:
+            status = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (status.st_mtime_ns, status.st_size, status.st_ino)
+
+    def wait(self, timeout: float = None) -> bool:
+        """wait for the file to change
+
+        Args:
+            timeout (float): seconds to wait, forever if None
+
+        Returns:
+            bool: True if the file changed before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            status = self._stat()
+            if status != self.status:
+                self.status = status
+                return True
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            time.sleep(
+                self.interval if remaining is None else min(self.interval, remaining)
+            )
+
+    def close(self):
+        pass
+
+
+def create_watcher(path: pathlib.Path, interval: float = 1.0):
+    """create an inotify watcher, or a polling watcher if inotify is unavailable
+
+    Args:
+        path (pathlib.Path): path of the file to watch
+        interval (float): polling interval in seconds
+
+    Returns:
+        InotifyWatcher or PollingWatcher: watcher of the file
+    """
+    try:
+        return InotifyWatcher(path)
+    except (AttributeError, OSError, TypeError):
+        return PollingWatcher(path, interval)
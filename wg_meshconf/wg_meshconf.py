@@ -4,7 +4,7 @@
 Name: wg-meshconf
 Creator: K4YT3X
 Date Created: July 19, 2020
-Last Modified: June 16, 2021
+Last Modified: October 19, 2026
 
 Licensed under the GNU General Public License Version 3 (GNU GPL v3),
     available at: https://www.gnu.org/licenses/gpl-3.0.txt
@@ -16,6 +16,39 @@ import pathlib
 import sys
 
 from .database_manager import DatabaseManager
+from .deploy_manager import TRANSPORTS, DeployManager
+
+
+def positive_int(value: str) -> int:
+    """argparse type of integers greater than zero"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    """argparse type of integers greater than or equal to zero"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a non-negative integer")
+    return number
+
+
+def positive_float(value: str) -> float:
+    """argparse type of floats greater than zero"""
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive number")
+    return number
+
+
+def non_negative_float(value: str) -> float:
+    """argparse type of floats greater than or equal to zero"""
+    number = float(value)
+    if not number >= 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a non-negative number")
+    return number
 
 
 def parse_arguments():
@@ -129,6 +162,90 @@ def parse_arguments():
         type=pathlib.Path,
         default=pathlib.Path.cwd() / "output",
     )
+    genconfig.add_argument(
+        "-w",
+        "--watch",
+        help="regenerate configuration files whenever the database changes",
+        action="store_true",
+    )
+    genconfig.add_argument(
+        "--interval",
+        help="polling interval in seconds if inotify is unavailable",
+        type=positive_float,
+        default=1.0,
+    )
+    genconfig.add_argument(
+        "--debounce",
+        help="seconds without further changes to wait before regenerating",
+        type=non_negative_float,
+        default=0.5,
+    )
+
+    # deploy generated config
+    deploy = subparsers.add_parser("deploy")
+    deploy.add_argument(
+        "name",
+        help="Name of the peer to deploy configuration for, \
+            configuration for all peers are deployed if omitted",
+        nargs="?",
+    )
+    deploy.add_argument(
+        "-i",
+        "--input",
+        help="directory containing configuration files generated by genconfig",
+        type=pathlib.Path,
+        default=pathlib.Path.cwd() / "output",
+    )
+    deploy.add_argument(
+        "-t",
+        "--transport",
+        help="method used to deliver configuration files to peers",
+        choices=TRANSPORTS.keys(),
+        default="ssh",
+    )
+    deploy.add_argument(
+        "--destination",
+        help="destination directory or path template containing {name} \
+            for the directory transport",
+    )
+    deploy.add_argument(
+        "--command",
+        dest="remote_command",
+        help="command receiving the configuration on stdin for the ssh transport, \
+            formatted with {name} and {endpoint}",
+        default="ssh {endpoint} 'umask 077 && cat > /etc/wireguard/wg0.conf'",
+    )
+    deploy.add_argument(
+        "-j",
+        "--jobs",
+        help="maximum concurrent deployments",
+        type=positive_int,
+        default=16,
+    )
+    deploy.add_argument(
+        "--retries",
+        help="retries for each failed deployment",
+        type=non_negative_int,
+        default=3,
+    )
+    deploy.add_argument(
+        "--backoff",
+        help="initial delay in seconds between retries, doubled every retry",
+        type=positive_float,
+        default=1.0,
+    )
+    deploy.add_argument(
+        "--timeout",
+        help="timeout in seconds for each deployment attempt",
+        type=positive_float,
+        default=30.0,
+    )
+    deploy.add_argument(
+        "-f",
+        "--force",
+        help="deploy configuration files even if they have not changed",
+        action="store_true",
+    )
 
     return parser.parse_args()
 
@@ -190,7 +307,40 @@ def main():
         database_manager.showpeers(args.name, args.verbose)
 
     elif args.command == "genconfig":
-        database_manager.genconfig(args.name, args.output)
+        if args.watch:
+            database_manager.watchconfig(
+                args.name, args.output, args.interval, args.debounce
+            )
+        else:
+            database_manager.genconfig(args.name, args.output)
+
+    elif args.command == "deploy":
+        if args.transport == "directory":
+            if args.destination is None:
+                print("Error: --destination is required", file=sys.stderr)
+                sys.exit(1)
+            template = args.destination
+        else:
+            template = args.remote_command
+
+        try:
+            transport = TRANSPORTS[args.transport](template)
+        except ValueError as error:
+            print(f"Error: {error}", file=sys.stderr)
+            sys.exit(1)
+
+        deploy_manager = DeployManager(
+            transport,
+            args.jobs,
+            args.retries,
+            args.backoff,
+            args.timeout,
+            args.force,
+        )
+        if not deploy_manager.deploy(
+            args.name, database_manager.read_database(), args.input
+        ):
+            sys.exit(1)
 
     # if no commands are specified
     else: